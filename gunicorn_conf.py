@@ -0,0 +1,40 @@
+"""
+Gunicorn settings for the web app.
+Usage:
+    gunicorn -c gunicorn_conf.py src.web.wsgi:app
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+# One worker per core: requests are I/O-bound threads plus CPU-bound reranker
+# inference, and the cores are split between the workers' torch thread pools
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+# Threaded workers keep serving other requests while one thread waits on
+# Pinecone/Gemini or runs reranker inference.
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+# Import the app once in the master; forked workers share those modules
+# copy-on-write. A torch reranker on CPU is built in the master too (when_ready)
+# so its weights are shared the same way; CUDA contexts and ONNX Runtime
+# sessions do not survive fork(), so those are loaded per worker instead.
+preload_app = True
+
+timeout = 120
+
+def when_ready(server):
+    # Runs in the master after the app is loaded, before any worker is forked
+    from src.web.app import get_reranker, reranker_fork_safe
+    if reranker_fork_safe():
+        get_reranker()
+
+def post_worker_init(worker):
+    # Split the cores between workers so their intra-op pools do not oversubscribe
+    import torch
+    torch.set_num_threads(max(1, multiprocessing.cpu_count() // worker.cfg.workers))
+    # Load the cross-encoder before the worker accepts requests, rather than on
+    # the first rerank call; a no-op when the master already built it
+    from src.web.app import get_reranker
+    get_reranker()
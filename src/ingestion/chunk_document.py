@@ -10,13 +10,8 @@ def chunk_text(text, chunk_size=1000, overlap=100):
     Returns:
     - List[str]: A list of text chunks.
     """
-    chunks = []
-    start = 0
-    while start < len(text):
-        end = min(start + chunk_size, len(text))
-        chunks.append(text[start:end])
-        start += chunk_size - overlap
-    return chunks
+    stride = chunk_size - overlap
+    return [text[start:start + chunk_size] for start in range(0, len(text), stride)]
 
 def chunk_document(document_text, metadata, chunk_size=500, overlap=80):
     """
@@ -5,23 +5,37 @@ PARA_MIN_CHARS = 80          # ignore ultra-short noise paragraphs
 FALLBACK_TARGET_CHARS = 600  # grouping size when no blank lines exist
 
 _sentence_end_re = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+_blank_line_re = re.compile(r'\n\s*\n')
+
+# All cleaning rules in one alternation so the page is scanned once:
+#   hyph   word-\ncontinuation -> wordcontinuation
+#   multi  3+ newlines -> paragraph break
+#   ws     runs of spaces/tabs and isolated line breaks -> single space
+_CLEAN_PATTERN = (
+    r'(?P<hyph>(\w)-\n(\w))'
+    r'|(?P<multi>\n{3,})'
+    r'|(?P<ws>(?:[ \t]|(?<!\n)\n(?!\n))+)'
+)
+_clean_re = re.compile(_CLEAN_PATTERN)
+# Most PDF text is pure ASCII; ASCII-only \w matching is noticeably cheaper
+_clean_re_ascii = re.compile(_CLEAN_PATTERN, re.ASCII)
+
+def _clean_dispatch(m: re.Match) -> str:
+    kind = m.lastgroup
+    if kind == 'hyph':
+        return m.group(2) + m.group(3)
+    if kind == 'multi':
+        return '\n\n'
+    return ' '
 
 def _clean_page_text(txt: str) -> str:
-    # Normalize newlines
+    # Normalize newlines, then apply all cleaning rules in a single pass
     txt = txt.replace('\r', '\n')
-    # Fix hyphenation across line breaks: word-\ncontinuation -> wordcontinuation
-    txt = re.sub(r'(\w)-\n(\w)', r'\1\2', txt)
-    # Remove isolated line breaks inside paragraphs: lines ending mid‑sentence
-    # First mark double newlines to preserve paragraph boundaries
-    txt = re.sub(r'\n{3,}', '\n\n', txt)
-    # Replace single newlines that are not followed by another newline with a space
-    txt = re.sub(r'(?<!\n)\n(?!\n)', ' ', txt)
-    # Collapse spaces
-    txt = re.sub(r'[ \t]+', ' ', txt)
-    return txt.strip()
+    clean_re = _clean_re_ascii if txt.isascii() else _clean_re
+    return clean_re.sub(_clean_dispatch, txt).strip()
 
 def _split_on_blank_lines(txt: str) -> List[str]:
-    parts = [p.strip() for p in re.split(r'\n\s*\n', txt) if p.strip()]
+    parts = [p.strip() for p in _blank_line_re.split(txt) if p.strip()]
     return parts
 
 def _fallback_sentence_grouping(txt: str) -> List[str]:
@@ -1,3 +1,15 @@
+# (output key, PDF metadata key) for every plain-text field
+_FIELDS = (
+    ("title", "/Title"),
+    ("author", "/Author"),
+    ("producer", "/Producer"),
+    ("creator", "/Creator"),
+    ("creation_date", "/CreationDate"),
+    ("modification_date", "/ModDate"),
+    ("keywords", "/Keywords"),
+    ("rgid", "/rgid"),
+)
+
 def extract_metadata(metadata):
     """
     Extracts and processes metadata from a given dictionary.
@@ -8,24 +20,9 @@ def extract_metadata(metadata):
     Returns:
         dict: A dictionary with cleaned and structured metadata.
     """
-    def safe_str(val):
-        # Convert IndirectObject or None to string
-        try:
-            return str(val).strip() if val is not None else ""
-        except Exception:
-            return ""
-        
-    extracted_metadata = {
-        "title": safe_str(metadata.get('/Title', '')),
-        "author": safe_str(metadata.get('/Author', '')),
-        "producer": safe_str(metadata.get('/Producer', '')),
-        "creator": safe_str(metadata.get('/Creator', '')),
-        "creation_date": safe_str(metadata.get('/CreationDate', '')),
-        "modification_date": safe_str(metadata.get('/ModDate', '')),
-        "keywords": safe_str(metadata.get('/Keywords', '')),
-        "apple_keywords": metadata.get('/AAPL:Keywords', []),
-        "rgid": safe_str(metadata.get('/rgid', ''))
-    }
+    # str() also resolves PyPDF2 IndirectObject values; None becomes ""
+    extracted_metadata = {key: str(metadata.get(pdf_key) or "").strip() for key, pdf_key in _FIELDS}
+    extracted_metadata["apple_keywords"] = metadata.get('/AAPL:Keywords', [])
 
     # Additional processing for dates if needed
     # Example: Convert PDF date format to a standard datetime object
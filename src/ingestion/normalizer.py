@@ -1,4 +1,5 @@
 from datetime import datetime
+from functools import lru_cache
 
 def normalize_metadata(metadata):
     normalized_metadata = {}
@@ -14,7 +15,11 @@ def normalize_metadata(metadata):
     
     return normalized_metadata
 
+@lru_cache(maxsize=4096)
 def normalize_date(date_str):
+    # Raw PDF dates (D:YYYYMMDDHHmmSS...) never match below; skip the raise/catch
+    if date_str.startswith('D:'):
+        return date_str
     try:
         # Example normalization: convert to ISO format
         date_obj = datetime.strptime(date_str, '%Y-%m-%d')
@@ -29,8 +34,10 @@ def normalize_document(document):
     # Normalize each field in the document
     for field, value in document.items():
         if field.lower() in data_fields:
-            normalized_document[field] = normalize_date(value)
-        else:
+            normalized_document[field] = normalize_date(value) if isinstance(value, str) else value
+        elif isinstance(value, dict):
             normalized_document[field] = normalize_metadata(value)
+        else:
+            normalized_document[field] = value.strip() if isinstance(value, str) else value
     
     return normalized_document
\ No newline at end of file
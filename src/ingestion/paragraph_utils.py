@@ -1,7 +1,11 @@
 import re
 
+_blank_lines_re = re.compile(r'\n\s*\n+')
+_tab_to_space = str.maketrans('\t', ' ')
+
 def normalize_whitespace(text: str) -> str:
-    return re.sub(r'[ \t]+', ' ', text).strip()
+    # Collapse runs of spaces/tabs without the regex engine; newlines are kept
+    return ' '.join(filter(None, text.translate(_tab_to_space).split(' '))).strip()
 
 def paragraphize(page_text: str, min_len=20):
     """
@@ -11,7 +15,7 @@ def paragraphize(page_text: str, min_len=20):
     """
     # Replace Windows newlines
     cleaned = page_text.replace('\r', '')
-    raw_paras = re.split(r'\n\s*\n+', cleaned)  # blank-line separated
+    raw_paras = _blank_lines_re.split(cleaned)  # blank-line separated
     paragraphs = []
     buffer = []
     for para in raw_paras:
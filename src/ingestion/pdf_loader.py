@@ -1,14 +1,36 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
 from PyPDF2 import PdfReader
 
-def load_pdf(file_path):
-    """Load a PDF file and extract text and metadata."""
-    reader = PdfReader(file_path)
-    text = ""
-    metadata = reader.metadata
+# Optional: PyMuPDF extracts text in C and is much faster than PyPDF2.
+try:
+    import fitz
+except ImportError:
+    fitz = None
 
-    for page in reader.pages:
-        text += page.extract_text() + "\n"
+# PyMuPDF metadata keys -> PyPDF2-style keys expected by extract_metadata
+_FITZ_METADATA_KEYS = {
+    "title": "/Title",
+    "author": "/Author",
+    "producer": "/Producer",
+    "creator": "/Creator",
+    "creationDate": "/CreationDate",
+    "modDate": "/ModDate",
+    "keywords": "/Keywords",
+}
 
+PARALLEL_PAGE_THRESHOLD = 16  # PyPDF2 only; below this, process startup costs more than it saves
+PAGES_PER_TASK = 8
+
+def load_pdf(file_path):
+    """Load a PDF file and extract text and metadata."""
+    pages, metadata = load_pdf_pages(file_path)
+    # Single join instead of repeated `text +=`, which is quadratic on long PDFs
+    text = "".join(page_text + "\n" for _, page_text in pages)
     return text, metadata
 
 def parse_pdf(file_path):
@@ -18,15 +40,93 @@ def parse_pdf(file_path):
     return text, metadata
 
 
-def load_pdf_pages(file_path):
+def _fitz_metadata(doc):
+    raw = doc.metadata or {}
+    return {pdf_key: raw[key] for key, pdf_key in _FITZ_METADATA_KEYS.items() if raw.get(key)}
+
+def _open_pdf(file_path):
+    return fitz.open(file_path) if fitz is not None else PdfReader(file_path)
+
+def _open_pdf_with_info(file_path):
+    pdf = _open_pdf(file_path)
+    if fitz is not None:
+        return pdf, _fitz_metadata(pdf), pdf.page_count
+    return pdf, pdf.metadata, len(pdf.pages)
+
+def _page_text(pdf, i):
+    if fitz is not None:
+        return pdf.load_page(i).get_text("text") or ""
+    return pdf.pages[i].extract_text() or ""
+
+def _page_texts(pdf, start, stop):
+    """(page_number, page_text) for 0-based pages [start, stop) of an open PDF."""
+    return [(i + 1, _page_text(pdf, i)) for i in range(start, stop)]
+
+def _extract_page_range(args):
+    # Process-pool worker: each task opens its own handle on the file
+    file_path, start, stop = args
+    return _page_texts(_open_pdf(file_path), start, stop)
+
+def load_pdf_pages(file_path, max_workers=None):
     """
     New: Return list of (page_number, page_text) plus metadata.
     page_number is 1-based for user friendliness.
+    Uses PyMuPDF when installed, otherwise PyPDF2. With PyPDF2 (pure Python,
+    holds the GIL), documents with more than PARALLEL_PAGE_THRESHOLD pages are
+    extracted across a process pool (pass max_workers=1 to force serial
+    extraction). PyMuPDF extracts in C in milliseconds per page, so it always
+    runs serially: a pool's startup would cost more than it saves.
+    """
+    pdf, metadata, page_count = _open_pdf_with_info(file_path)
+    if fitz is not None or page_count <= PARALLEL_PAGE_THRESHOLD or max_workers == 1:
+        return _page_texts(pdf, 0, page_count), metadata
+
+    tasks = [
+        (file_path, start, min(start + PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PAGES_PER_TASK)
+    ]
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        pages = [page for chunk in ex.map(_extract_page_range, tasks) for page in chunk]
+    return pages, metadata
+
+def _plain_metadata(metadata):
+    # PyPDF2 values are str subclasses tied to the reader; plain values pickle cleanly
+    if metadata is None:
+        return None
+    plain = {}
+    for key in metadata:
+        value = metadata[key]  # indexing resolves PyPDF2 indirect objects
+        plain[key] = str(value) if isinstance(value, str) else value
+    return plain
+
+def _parse_pdf_pages(file_path):
+    # Process-pool worker for parse_pdfs; pages are extracted serially in here.
+    # The extraction is timed here because the parent only sees its wait on the pool
+    start = time.perf_counter()
+    pages, metadata = load_pdf_pages(file_path, max_workers=1)
+    return file_path, pages, _plain_metadata(metadata), time.perf_counter() - start
+
+def parse_pdfs(file_paths, max_workers=None):
+    """
+    Parse many PDFs across a process pool, yielding (file_path, pages, metadata,
+    seconds) in input order, where seconds is the extraction time in the worker. Results stream back while later files are still being
+    parsed, so callers can chunk/embed one document while the pool works ahead.
+    At most 2 * max_workers documents are queued or parsed ahead of the
+    consumer, so memory stays bounded on large corpora; closing the generator
+    cancels the queued work. Each document is extracted serially inside its
+    worker; for a handful of very large PDFs, call load_pdf_pages per file
+    instead so their pages are spread across cores.
     """
-    reader = PdfReader(file_path)
-    metadata = reader.metadata
-    pages = []
-    for i, page in enumerate(reader.pages, start=1):
-        page_text = page.extract_text() or ""
-        pages.append((i, page_text))
-    return pages, metadata
\ No newline at end of file
+    max_workers = max_workers or os.cpu_count() or 1
+    paths = iter(file_paths)
+    ex = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        window = deque(ex.submit(_parse_pdf_pages, path) for path in islice(paths, 2 * max_workers))
+        while window:
+            result = window.popleft().result()
+            # Refill before yielding so the pool keeps working while the caller does
+            for path in islice(paths, 1):
+                window.append(ex.submit(_parse_pdf_pages, path))
+            yield result
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
@@ -1,6 +1,12 @@
 from src.observability.metrics import init_metrics, get_meter
 
-init_metrics()
+def setup(export_interval_sec: int = 10):
+    """
+    Start the metrics exporter. Call once from each entry point (web app, scripts).
+    Importing this module no longer does it: instruments below are created on the
+    API's proxy meter and bind to the real provider once setup() runs.
+    """
+    init_metrics(export_interval_sec)
 
 # Prevent resource attribute duplication as metric labels
 FORBIDDEN_LABELS = {"service.name", "deployment.environment"}
@@ -22,15 +28,17 @@ pdf_pages_total = meter.create_counter("pdf_pages_total", description="Number of
 text_extraction_failures_total = meter.create_counter("text_extraction_failures_total", description="Count of page-level text extraction failures")
 
 pdf_load_seconds = meter.create_histogram("pdf_load_seconds", description="Time to load and extract text from PDF")
+pdf_parse_wait_seconds = meter.create_histogram("pdf_parse_wait_seconds", description="Time ingestion waited for the parse pool to deliver a PDF")
 metadata_extract_seconds = meter.create_histogram("metadata_extract_seconds", description="Time to extract and normalize metadata")
 chunking_seconds = meter.create_histogram("chunking_seconds", description="Time to create text chunks")
 
 # Query-side existing metrics
-queries_total = meter.create_counter("queries_total", description="Count of vector queries")
+queries_total = meter.create_counter("queries_total", description="Count of search requests, including result-cache hits")
 query_errors_total = meter.create_counter("query_errors_total", description="Count of query errors")
 query_end_to_end_seconds = meter.create_histogram("query_end_to_end_seconds", description="End-to-end query duration")
 vector_search_seconds = meter.create_histogram("vector_search_seconds", description="Vector search duration")
 retrieval_result_count = meter.create_counter("retrieval_result_count", description="Number of results returned by retrieval")
+search_cache_hits_total = meter.create_counter("search_cache_hits_total", description="Searches answered from the in-process result cache")
 
 # New: vector store writes
 upsert_records_total = meter.create_counter("upsert_records_total", description="Total records upserted to the vector store")
@@ -44,13 +52,14 @@ no_result_queries_total = meter.create_counter("no_result_queries_total", descri
 
 __all__ = [
     # helper
-    "safe_attrs",
+    "setup", "safe_attrs",
     # ingestion
     "documents_ingested_total", "ingestion_errors_total", "document_ingest_seconds",
     "chunk_count_total", "chunk_chars_sum", "pdf_pages_total", "text_extraction_failures_total",
-    "pdf_load_seconds", "metadata_extract_seconds", "chunking_seconds",
+    "pdf_load_seconds", "pdf_parse_wait_seconds", "metadata_extract_seconds", "chunking_seconds",
     # query existing
     "queries_total", "query_errors_total", "query_end_to_end_seconds", "vector_search_seconds", "retrieval_result_count",
+    "search_cache_hits_total",
     # vector store writes
     "upsert_records_total", "upsert_errors_total", "upsert_batch_seconds",
     # query effectiveness
@@ -61,14 +70,23 @@ __all__ = [
 from contextlib import contextmanager
 import time as _time
 
+_NO_ATTRS: dict = {}
+
 @contextmanager
 def time_histogram(hist_instrument, attributes: dict | None = None):
     start = _time.perf_counter()
     try:
         yield
         duration = _time.perf_counter() - start
-        hist_instrument.record(duration, attributes or {})
+        hist_instrument.record(duration, attributes or _NO_ATTRS)
     except Exception:
         duration = _time.perf_counter() - start
         hist_instrument.record(duration, {**(attributes or {}), "status": "error"})
-        raise
\ No newline at end of file
+        raise
+
+@contextmanager
+def time_histogram_ok(hist_instrument, attributes: dict | None = None):
+    # Hot-path variant: integer clock, no error tagging (nothing is recorded if the block raises)
+    start = _time.perf_counter_ns()
+    yield
+    hist_instrument.record((_time.perf_counter_ns() - start) / 1e9, attributes or _NO_ATTRS)
@@ -1,8 +1,10 @@
+import logging
 import os
 from opentelemetry import metrics
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+from opentelemetry.exporter.otlp.proto.http import Compression
 from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
 from opentelemetry.sdk.metrics.view import View, ExplicitBucketHistogramAggregation
 
@@ -10,6 +12,8 @@ _INITIALIZED = False
 _METER = None
 _PROVIDER: MeterProvider | None = None
 
+logger = logging.getLogger(__name__)
+
 def init_metrics(export_interval_sec: int = 10):
     global _INITIALIZED, _METER, _PROVIDER
     if _INITIALIZED:
@@ -27,8 +31,9 @@ def init_metrics(export_interval_sec: int = 10):
     #     # "http://localhost:4318/v1/metrics"
     # )
     endpoint = "http://localhost:4318/v1/metrics"
-    print("[otel] resolved metrics exporter endpoint:", endpoint)
-    exporter = OTLPMetricExporter(endpoint=endpoint)
+    logger.debug("[otel] resolved metrics exporter endpoint: %s", endpoint)
+    # gzip the protobuf payload; repeated exports of the same series compress well
+    exporter = OTLPMetricExporter(endpoint=endpoint, compression=Compression.Gzip, timeout=10)
     reader = PeriodicExportingMetricReader(
         exporter,
         export_interval_millis=export_interval_sec * 1000
@@ -1,3 +1,4 @@
+import logging
 import os
 from opentelemetry import trace
 from opentelemetry.sdk.resources import Resource
@@ -10,6 +11,8 @@ from opentelemetry.sdk.trace.sampling import TraceIdRatioBased, ParentBased
 
 _INITIALIZED = False
 
+logger = logging.getLogger(__name__)
+
 def init_tracing(
     service_name: str = "rag-document-parser",
     console: bool = False,
@@ -31,7 +34,7 @@ def init_tracing(
     # OTLP endpoint (defaults to localhost:4318 if not provided)
     # otlp_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
     otlp_exporter = OTLPSpanExporter(endpoint="http://localhost:4318/v1/traces")
-    print("[otel] resolved exporter endpoint:", otlp_exporter._endpoint)
+    logger.debug("[otel] resolved exporter endpoint: %s", otlp_exporter._endpoint)
     provider.add_span_processor(BatchSpanProcessor(otlp_exporter))
 
     if console:
@@ -2,13 +2,29 @@ from transformers import AutoModelForSequenceClassification, AutoTokenizer
 import torch
 
 class CrossEncoderReranker:
-    def __init__(self, model_name="cross-encoder/ms-marco-MiniLM-L-12-v2", device=None):
+    def __init__(self, model_name="cross-encoder/ms-marco-MiniLM-L-12-v2", device=None, batch_size=32):
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
         self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.batch_size = batch_size
         self.model = self.model.to(self.device)
+        if self.device.startswith("cuda"):
+            self.model = self.model.half()  # FP16 halves memory traffic on GPU
         self.model.eval()  # Set model to evaluation mode
 
+    def _score(self, pairs):
+        # Tokenize one sub-batch; padding only reaches its longest pair
+        encodings = self.tokenizer.batch_encode_plus(
+            pairs,
+            padding=True,
+            truncation=True,
+            return_tensors="pt",
+            max_length=256,
+        )
+        encodings = {k: v.to(self.device, non_blocking=True) for k, v in encodings.items()}
+        logits = self.model(**encodings).logits
+        return logits.view(-1).float().cpu().tolist()
+
     def rerank(self, query, results, text_key="text", top_n=5):
         """
         Args:
@@ -20,26 +36,21 @@ class CrossEncoderReranker:
         Returns:
             List of top_n results, sorted by cross-encoder score (descending)
         """
+        if not results:
+            return []
 
         pairs = [(query, r[text_key]) for r in results]
-        # Tokenize all pairs
-        encodings = self.tokenizer.batch_encode_plus(
-            pairs,
-            padding=True,
-            truncation=True,
-            return_tensors="pt",
-            max_length=256,
-        )
-        encodings = {k: v.to(self.device) for k, v in encodings.items()}
-        with torch.no_grad():
-            logits = self.model(**encodings).logits
-            # print("Model logits:", logits)
-            scores = logits.squeeze(-1).cpu().numpy()
-            # scores = np.nan_to_num(scores, nan=0.0)
-        # print('Scores:', scores[:10])
+        # Batch pairs of similar length together so little compute goes to [PAD]
+        order = sorted(range(len(pairs)), key=lambda i: len(pairs[i][1]))
+        scores = [0.0] * len(pairs)
+        with torch.inference_mode():
+            for start in range(0, len(order), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                for i, score in zip(batch, self._score([pairs[i] for i in batch])):
+                    scores[i] = score
+
         # Attach scores and rerank
         for res, score in zip(results, scores):
             res["rerank_score"] = float(score)
         reranked = sorted(results, key=lambda x: x["rerank_score"], reverse=True)
-        # print('reranked results:', reranked[:top_n])
-        return reranked[:top_n]
\ No newline at end of file
+        return reranked[:top_n]
@@ -1,34 +1,40 @@
 import argparse
+import json
 import mlflow
 from collections import defaultdict
+from operator import itemgetter
 
-def load_feedback_log(feedback_log_path):
-    import json
-    feedbacks = []
-    with open(feedback_log_path, "r") as f:
+# Optional: orjson parses each JSONL line several times faster than json
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+def load_grouped_feedback(feedback_log_path):
+    """Stream the log once, grouping entries by (dense_model, rerank_model) as they are read."""
+    grouped = defaultdict(list)
+    with open(feedback_log_path, "rb") as f:
         for line in f:
-            feedbacks.append(json.loads(line))
-    return feedbacks
+            fb = _loads(line)
+            grouped[(fb.get("dense_model", "unknown"), fb.get("rerank_model", None))].append(fb)
+    return grouped
 
 def feedback_metrics(feedbacks, k):
     if not feedbacks:
         return 0.0, 0.0
-    feedback_values = [f["feedback"] for f in feedbacks]
-    precision = sum(feedback_values) / len(feedback_values)
-    hit_rate = 1.0 if any(feedback_values) else 0.0
+    # Feedback is 0/1, so one summing pass gives both precision and hit rate
+    relevant = sum(f["feedback"] for f in feedbacks)
+    precision = relevant / len(feedbacks)
+    hit_rate = 1.0 if relevant else 0.0
     return precision, hit_rate
 
 def main(feedback_log_path, k=5):
-    feedbacks = load_feedback_log(feedback_log_path)
-    grouped = defaultdict(list)
-    for fb in feedbacks:
-        dense = fb.get("dense_model", "unknown")
-        rerank = fb.get("rerank_model", None)
-        grouped[(dense, rerank)].append(fb)
+    grouped = load_grouped_feedback(feedback_log_path)
 
     dense_metrics = defaultdict(list)
     rerank_metrics = defaultdict(list)
     all_metrics = {}
+    metrics_to_log = {}
 
     mlflow.set_experiment("rag-feedback-eval")
     with mlflow.start_run():
@@ -37,8 +43,8 @@ def main(feedback_log_path, k=5):
             avg_precision, avg_hit_rate = feedback_metrics(group, k)
             tag = f"{dense_model}_{rerank_model or 'none'}"
             all_metrics[(dense_model, rerank_model)] = (avg_precision, avg_hit_rate)
-            mlflow.log_metric(f"precision_at_{k}_{tag}", avg_precision)
-            mlflow.log_metric(f"hit_rate_at_{k}_{tag}", avg_hit_rate)
+            metrics_to_log[f"precision_at_{k}_{tag}"] = avg_precision
+            metrics_to_log[f"hit_rate_at_{k}_{tag}"] = avg_hit_rate
             print(f"[{tag}] Precision@{k}: {avg_precision:.3f} | Hit Rate@{k}: {avg_hit_rate:.3f}")
 
             # Collect for comparison
@@ -47,23 +53,27 @@ def main(feedback_log_path, k=5):
             else:
                 rerank_metrics[rerank_model].append(avg_precision)
 
+        # One batched request instead of a log_metric round-trip per metric
+        mlflow.log_metrics(metrics_to_log)
         mlflow.log_artifact(feedback_log_path)
 
         # Compare dense models
         print("\n=== Dense Model Comparison (no reranker) ===")
-        best_dense = max(dense_metrics.items(), key=lambda x: sum(x[1])/len(x[1]) if x[1] else 0)
-        for model, scores in dense_metrics.items():
-            avg = sum(scores)/len(scores) if scores else 0
+        dense_avgs = {m: (sum(s) / len(s) if s else 0.0) for m, s in dense_metrics.items()}
+        for model, avg in dense_avgs.items():
             print(f"Dense Model '{model}': Avg Precision@{k} = {avg:.3f}")
-        print(f"Best Dense Model: {best_dense[0]} (Avg Precision@{k} = {sum(best_dense[1])/len(best_dense[1]):.3f})")
+        if dense_avgs:
+            best_dense = max(dense_avgs.items(), key=itemgetter(1))
+            print(f"Best Dense Model: {best_dense[0]} (Avg Precision@{k} = {best_dense[1]:.3f})")
 
         # Compare reranker models
         print("\n=== Reranker Model Comparison ===")
-        best_rerank = max(rerank_metrics.items(), key=lambda x: sum(x[1])/len(x[1]) if x[1] else 0)
-        for model, scores in rerank_metrics.items():
-            avg = sum(scores)/len(scores) if scores else 0
+        rerank_avgs = {m: (sum(s) / len(s) if s else 0.0) for m, s in rerank_metrics.items()}
+        for model, avg in rerank_avgs.items():
             print(f"Reranker Model '{model}': Avg Precision@{k} = {avg:.3f}")
-        print(f"Best Reranker Model: {best_rerank[0]} (Avg Precision@{k} = {sum(best_rerank[1])/len(best_rerank[1]):.3f})")
+        if rerank_avgs:
+            best_rerank = max(rerank_avgs.items(), key=itemgetter(1))
+            print(f"Best Reranker Model: {best_rerank[0]} (Avg Precision@{k} = {best_rerank[1]:.3f})")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
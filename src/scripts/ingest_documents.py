@@ -1,14 +1,17 @@
 import os, time
-# import json
+import json
+import logging
+import queue
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
-from src.ingestion.pdf_loader import load_pdf_pages
+from src.ingestion.pdf_loader import load_pdf_pages, parse_pdfs
 from src.ingestion.metadata_schema import extract_metadata
 from src.ingestion.normalizer import normalize_metadata
 from src.ingestion.chunk_document import chunk_document
-from src.storage.vector_store import store_vectors
-from src.storage.sparse_store import store_sparse_vectors 
+from src.storage.vector_store import DEFAULT_DENSE_MODEL, ensure_index, store_vectors
+from src.storage.sparse_store import ensure_sparse_index, store_sparse_vectors
 # from src.logging_utils.audit_logger import log_event
 
 from src.observability.instruments import (
@@ -21,83 +24,216 @@ from src.observability.instruments import (
     pdf_pages_total,
     text_extraction_failures_total,
     pdf_load_seconds,
+    pdf_parse_wait_seconds,
     metadata_extract_seconds,
     chunking_seconds,
     # helper
     safe_attrs,
+    time_histogram_ok,
+    setup as setup_metrics,
 )
 
-def ingest_documents(directory):
-    for filename in os.listdir(directory):
-        if filename.endswith('.pdf'):
-            file_path = os.path.join(directory, filename)
-            print(f'Processing {file_path}...')
-            
+logger = logging.getLogger(__name__)
+
+# Attribute sets are constant; build them once instead of per document/page
+_EMPTY_ATTRS = safe_attrs({})
+_SUCCESS_ATTRS = safe_attrs({"status": "success"})
+_ERROR_ATTRS = safe_attrs({"status": "error"})
+_EMPTY_TEXT_ATTRS = safe_attrs({"reason": "empty_text"})
+
+UPSERT_BATCH_CHUNKS = 900  # chunks buffered across files per upsert round (multiple of the 90-record batch)
+
+MANIFEST_NAME = ".ingest_manifest.json"  # per-directory record of already-ingested PDFs
+
+def _dense_model():
+    return os.getenv("DENSE_MODEL") or DEFAULT_DENSE_MODEL
+
+def _store_chunks(chunks):
+    store_vectors(chunks, dense_model=_dense_model())
+    store_sparse_vectors(chunks)
+
+def _load_each(file_paths, max_workers=None):
+    # Same (file_path, pages, metadata, seconds) tuples as parse_pdfs, parsed in turn
+    for path in file_paths:
+        start = time.perf_counter()
+        pages, metadata = load_pdf_pages(path, max_workers=max_workers)
+        yield path, pages, metadata, time.perf_counter() - start
+
+def _parsed_pdfs(file_paths, max_workers=None):
+    # Parse whole documents across a process pool; a single PDF instead goes
+    # through load_pdf_pages, which spreads its pages across cores (PyPDF2 only)
+    if len(file_paths) < 2:
+        return _load_each(file_paths, max_workers=max_workers)
+    return parse_pdfs(file_paths, max_workers=max_workers)
+
+def _pdf_paths(directory):
+    # scandir's entries carry the joined path and the file type from the listing
+    with os.scandir(directory) as it:
+        return [entry.path for entry in it if entry.name.lower().endswith('.pdf') and entry.is_file()]
+
+def _fingerprint(file_path):
+    # Cheap change detector: a rewritten PDF changes size or mtime; the dense
+    # model is included so switching models re-ingests into the new index
+    st = os.stat(file_path)
+    return [st.st_size, st.st_mtime_ns, _dense_model()]
+
+def _load_manifest(manifest_path):
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _mark_ingested(manifest, manifest_path, file_paths, fingerprints):
+    for file_path in file_paths:
+        manifest[os.path.basename(file_path)] = fingerprints[file_path]
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+def _upsert_worker(batches, errors, manifest, manifest_path, fingerprints):
+    # Consumer thread: upserts are network-bound, so they run while the main
+    # thread parses and chunks the next documents. A document only counts as
+    # ingested (or failed) once the batch carrying its chunks has been stored.
+    while True:
+        item = batches.get()
+        if item is None:
+            return
+        if errors:
+            continue  # keep draining so the producer never blocks on a full queue
+        chunks, files = item
+        try:
+            if chunks:
+                _store_chunks(chunks)
+        except Exception as e:
+            now = time.perf_counter()
+            for _, start in files:
+                document_ingest_seconds.record(now - start, _ERROR_ATTRS)
+            ingestion_errors_total.add(len(files), safe_attrs({"error.type": e.__class__.__name__}))
+            errors.append(e)
+            continue
+        now = time.perf_counter()
+        for _, start in files:
+            document_ingest_seconds.record(now - start, _SUCCESS_ATTRS)
+        documents_ingested_total.add(len(files), _SUCCESS_ATTRS)
+        try:
+            _mark_ingested(manifest, manifest_path, [path for path, _ in files], fingerprints)
+        except OSError:
+            # The batch is already stored, so this is not an ingestion failure;
+            # the files will just be upserted again on the next run
+            logger.exception("Could not update ingest manifest %s", manifest_path)
+
+def ingest_documents(directory, max_workers=None, force=False, manifest_path=None):
+    """
+    Ingest every PDF in directory. PDFs whose size/mtime match the manifest
+    from an earlier run are skipped unless force=True; a PDF is only recorded
+    once its chunks have been upserted. The manifest defaults to
+    MANIFEST_NAME inside directory; pass manifest_path when that directory is
+    read-only or shared.
+    """
+    if manifest_path is None:
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+    manifest = {} if force else _load_manifest(manifest_path)
+    fingerprints = {path: _fingerprint(path) for path in _pdf_paths(directory)}
+    file_paths = [path for path, fp in fingerprints.items() if manifest.get(os.path.basename(path)) != fp]
+    if file_paths:
+        # Resolve both indexes (cached per process) before the loop, so the
+        # connection setup is not billed to the first document's metrics
+        ensure_index(_dense_model())
+        ensure_sparse_index()
+    parsed = _parsed_pdfs(file_paths, max_workers=max_workers)
+    pending = []
+    pending_files = []
+    # Bounded: when Pinecone falls behind, put() blocks the main loop, which
+    # stops pulling from parse_pdfs; its look-ahead window (2 * max_workers
+    # documents) then stalls too, so parsed text cannot pile up in memory
+    batches = queue.Queue(maxsize=2)
+    errors = []
+    uploader = threading.Thread(
+        target=_upsert_worker,
+        args=(batches, errors, manifest, manifest_path, fingerprints),
+        name="ingest-upsert",
+        daemon=True,
+    )
+    uploader.start()
+    try:
+        for file_path in file_paths:
+            if errors:
+                break
+            filename = os.path.basename(file_path)
+            logger.info("Processing %s", file_path)
+        
             start = time.perf_counter()
-            status = "success"
             try:
-                # Phase: load PDF + extract page texts
-                t0 = time.perf_counter()
-                pages, pdf_metadata = load_pdf_pages(file_path)
-                pdf_load_seconds.record(time.perf_counter() - t0, safe_attrs({}))
-
-                # Count pages and page-level extraction failures
-                page_texts = []
-                page_nums = []
-                failures = 0
-                for page_num, page_text in pages:
-                    if page_text:
-                        page_texts.append(page_text)
-                    else:
-                        page_texts.append("")
-                        failures += 1
-                    page_nums.append(page_num)
-                pdf_pages_total.add(len(pages), safe_attrs({}))
-                if failures:
-                    text_extraction_failures_total.add(failures, safe_attrs({"reason": "empty_text"}))
-                
-                # pdf_content = "\n".join(page_texts)
+                # Phase: load PDF + extract page texts. The pool parses ahead in
+                # the background, so the wait here is recorded separately from
+                # the extraction time measured in the worker
+                with time_histogram_ok(pdf_parse_wait_seconds):
+                    _, pages, pdf_metadata, load_seconds = next(parsed)
+                pdf_load_seconds.record(load_seconds, _EMPTY_ATTRS)
+
+                pdf_pages_total.add(len(pages), _EMPTY_ATTRS)
 
                 # Phase: extract + normalize metadata
-                t1 = time.perf_counter()
-                metadata = extract_metadata(pdf_metadata)
-                normalized_metadata = normalize_metadata(metadata)
-                metadata_extract_seconds.record(time.perf_counter() - t1, safe_attrs({}))
-                
+                with time_histogram_ok(metadata_extract_seconds):
+                    metadata = extract_metadata(pdf_metadata)
+                    normalized_metadata = normalize_metadata(metadata)
+            
                 # Phase: chunking
-                t2 = time.perf_counter()
-                chunks = []
-                for page_num, page_text in zip(page_nums, page_texts):
-                    page_chunks = chunk_document(page_text, normalized_metadata)
-                    
-                    chunk_count_total.add(len(page_chunks), safe_attrs({}))
-                    total_chars = sum(len(c.get('chunk', '')) for c in page_chunks)
-                    if total_chars:
-                        chunk_chars_sum.add(total_chars, safe_attrs({}))
-                    for idx, chunk in enumerate(page_chunks):
-                        chunk['page_number'] = page_num
-                        chunk['paragraph_index'] = idx
-                        chunk['source_file'] = filename
-                        chunks.append(chunk)
-                
-                chunking_seconds.record(time.perf_counter() - t2, safe_attrs({}))
-                
-                # Store vectors
-                store_vectors(chunks, dense_model=os.getenv("DENSE_MODEL"))
-                store_sparse_vectors(chunks)
-                
+                with time_histogram_ok(chunking_seconds):
+                    chunks = []
+                    failures = 0
+                    for page_num, page_text in pages:
+                        # Empty pages are extraction failures and yield no chunks;
+                        # count them in the same pass instead of a separate scan
+                        if not page_text:
+                            failures += 1
+                            continue
+                        page_chunks = chunk_document(page_text, normalized_metadata)
+
+                        chunk_count_total.add(len(page_chunks), _EMPTY_ATTRS)
+                        total_chars = sum(len(c.get('chunk', '')) for c in page_chunks)
+                        if total_chars:
+                            chunk_chars_sum.add(total_chars, _EMPTY_ATTRS)
+                        for idx, chunk in enumerate(page_chunks):
+                            chunk['page_number'] = page_num
+                            chunk['paragraph_index'] = idx
+                            chunk['source_file'] = filename
+                            chunks.append(chunk)
+                if failures:
+                    text_extraction_failures_total.add(failures, _EMPTY_TEXT_ATTRS)
+            
+                # Store vectors once enough chunks have built up, so small PDFs
+                # share upsert requests instead of each sending a partial batch
+                pending.extend(chunks)
+                pending_files.append((file_path, start))
+                if len(pending) >= UPSERT_BATCH_CHUNKS:
+                    batches.put((pending, pending_files))
+                    pending = []
+                    pending_files = []
+            
                 # # Log the ingestion event
                 # log_event(f'Document ingested: {filename}', metadata)
             except Exception as e:
-                status = "error"
+                # Success is recorded by the upsert thread once this document's batch is stored
+                document_ingest_seconds.record(time.perf_counter() - start, _ERROR_ATTRS)
                 ingestion_errors_total.add(1, safe_attrs({"error.type": e.__class__.__name__}))
                 raise
-            finally:
-                duration = time.perf_counter() - start
-                document_ingest_seconds.record(duration, safe_attrs({"status": status}))
-                if status == "success":
-                    documents_ingested_total.add(1, safe_attrs({"status": "success"}))
+    finally:
+        # Stop the parse pool from working through the remaining PDFs when the
+        # loop ends early (a failed document or upsert)
+        parsed.close()
+        # Flush the tail, including documents chunked before a failing one
+        if pending_files and not errors:
+            batches.put((pending, pending_files))
+        batches.put(None)
+        uploader.join()
+    if errors:
+        raise errors[0]
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    setup_metrics()
     directory = '/Users/jaganraajan/projects/rag-document-parser/docs/pdfs'  # Update this path
     ingest_documents(directory)
\ No newline at end of file
@@ -1,3 +1,7 @@
+import os
+import uuid
+from typing import List
+
 class IDStrategy:
     def __init__(self):
         self.current_id = 0
@@ -7,4 +11,9 @@ class IDStrategy:
         return f"id_{self.current_id}"
 
     def reset_id(self):
-        self.current_id = 0
\ No newline at end of file
+        self.current_id = 0
+
+def uuid4_strs(n: int) -> List[str]:
+    """Return n random (version 4) UUID strings from a single os.urandom read."""
+    raw = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
@@ -1,9 +1,102 @@
-from typing import List, Dict, Any
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping
 
 from .sparse_store import sparse_query
 from .vector_store import DEFAULT_DENSE_MODEL, semantic_query
+from src.observability.instruments import (
+    queries_total, query_end_to_end_seconds, search_cache_hits_total, safe_attrs,
+)
+
+# Shared across requests so threads are not created per search
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sparse-search")
+
+# Result cache for repeated queries: (query, top_k, dense_model) -> (stored_at, results)
+CACHE_TTL_SECONDS = 900
+CACHE_MAX_ENTRIES = 512
+_result_cache: "OrderedDict[tuple, tuple[float, Dict[str, Any]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Shared read-only fallback for hits without "fields" / responses without "result"
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+def _cache_key(query: str, top_k: int, dense_model: str) -> tuple:
+    if len(query) > 256:  # bound key size for very long queries
+        query = hashlib.blake2b(query.encode(), digest_size=16).hexdigest()
+    return (query, top_k, dense_model)
+
+def _copy_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    # Callers add keys (highlighted, rerank_score) to each row; give them their own rows
+    return {name: [dict(r) for r in rows] for name, rows in results.items()}
 
 def search_with_metadata(query: str, top_k: int = 5, dense_model: str = DEFAULT_DENSE_MODEL) -> List[Dict[str, Any]]:
+    """
+    Entry point for searches. Records queries_total and query_end_to_end_seconds
+    for every request, labelled cache="hit"/"miss", so cache hits are not
+    invisible on the dashboards.
+    """
+    start = time.perf_counter()
+    status, cache = "error", "miss"
+    try:
+        results, hit = _cached_search(query, top_k, dense_model)
+        status = "success"
+        if hit:
+            cache = "hit"
+            search_cache_hits_total.add(1, safe_attrs({}))
+        return results
+    finally:
+        attrs = {"top_k": str(top_k), "cache": cache}
+        queries_total.add(1, safe_attrs(attrs))
+        query_end_to_end_seconds.record(time.perf_counter() - start, safe_attrs({**attrs, "status": status}))
+
+def _cached_search(query: str, top_k: int, dense_model: str) -> tuple[Dict[str, Any], bool]:
+    """
+    Cached front for _search: identical (query, top_k, dense_model) calls within
+    CACHE_TTL_SECONDS are answered from memory without hitting Pinecone.
+    Returns (results, cache_hit).
+    """
+    if not query:
+        return _search(query, top_k, dense_model), False
+    key = _cache_key(query, top_k, dense_model)
+    with _cache_lock:
+        entry = _result_cache.get(key)
+        if entry is not None:
+            if time.monotonic() - entry[0] < CACHE_TTL_SECONDS:
+                _result_cache.move_to_end(key)
+                return _copy_results(entry[1]), True
+            del _result_cache[key]
+
+    results = _search(query, top_k, dense_model)
+    with _cache_lock:
+        _result_cache[key] = (time.monotonic(), results)
+        if len(_result_cache) > CACHE_MAX_ENTRIES:
+            _result_cache.popitem(last=False)
+    return _copy_results(results), False
+
+def _normalize_hit(h: Dict[str, Any]) -> Dict[str, Any]:
+    fields = h.get("fields") or _EMPTY
+    meta = {k[5:]: v for k, v in fields.items() if k.startswith("meta_")}  # strip 'meta_'
+    get_meta = meta.get
+    return {
+        "id": h.get("_id"),
+        "score": h.get("_score"),
+        "text": fields.get("chunk_text") or fields.get("text") or "",
+        "metadata": meta,
+        "page_number": get_meta("page_number"),
+        "paragraph_index": get_meta("paragraph_index"),
+        "source_file": get_meta("source_file"),
+        "title": get_meta("title"),
+        "raw": h
+    }
+
+def _normalize(raw: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [_normalize_hit(h) for h in (raw.get("result") or _EMPTY).get("hits", ())]
+
+def _search(query: str, top_k: int, dense_model: str) -> Dict[str, Any]:
     """
     Simplified parser for Pinecone response shape:
       {
@@ -24,35 +117,12 @@ def search_with_metadata(query: str, top_k: int = 5, dense_model: str = DEFAULT_
       }
     """
     initial_k = top_k * 4
+    # Dense and sparse queries are independent network calls: overlap them
+    sparse_future = _executor.submit(sparse_query, query, top_k=top_k)
     dense_results_raw = semantic_query(query, top_k=initial_k, dense_model=dense_model)
-    sparse_results_raw = sparse_query(query, top_k=top_k)
-
-    
-    def normalize(raw):
-        hits = raw.get("result", {}).get("hits", [])
-        normalized: List[Dict[str, Any]] = []
-        for h in hits:
-            fields = h.get("fields", {}) or {}
-            text = fields.get("chunk_text") or fields.get("text") or ""
-            # print('text is', text)
-            meta: Dict[str, Any] = {}
-            for k, v in fields.items():
-                if k.startswith("meta_"):
-                    meta[k[5:]] = v  # strip 'meta_'
-            normalized.append({
-                "id": h.get("_id"),
-                "score": h.get("_score"),
-                "text": text,
-                "metadata": meta,
-                "page_number": meta.get("page_number"),
-                "paragraph_index": meta.get("paragraph_index"),
-                "source_file": meta.get("source_file"),
-                "title": meta.get("title"),
-                "raw": h
-            })
-        return normalized
-    
+    sparse_results_raw = sparse_future.result()
+
     return {
-        "dense_results": normalize(dense_results_raw),
-        "sparse_results": normalize(sparse_results_raw)
+        "dense_results": _normalize(dense_results_raw),
+        "sparse_results": _normalize(sparse_results_raw)
     }
\ No newline at end of file
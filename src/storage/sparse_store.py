@@ -1,23 +1,21 @@
-import os
-import uuid
+import functools
+import logging
 from typing import Iterable, Dict, List, Any, Optional
 
-from pinecone import Pinecone, ServerlessSpec
-from .vector_store import NAMESPACE, INDEX_NAME as DENSE_INDEX_NAME, ensure_index as ensure_dense_index
+from .id_strategy import uuid4_strs
+from .vector_store import pc, NAMESPACE, INDEX_NAME as DENSE_INDEX_NAME, ensure_index as ensure_dense_index
 
-PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
-if not PINECONE_API_KEY:
-    raise RuntimeError("Missing PINECONE_API_KEY for sparse store.")
-
-pc = Pinecone(api_key=PINECONE_API_KEY)
+logger = logging.getLogger(__name__)
 
 SPARSE_INDEX_NAME = "philosophy-rag-sparse"
 SPARSE_MODEL = "pinecone-sparse-english-v0"  # managed sparse encoder
 
+@functools.lru_cache(maxsize=1)
 def ensure_sparse_index():
     """
     Create (once) a serverless sparse index using the managed sparse model.
-    Records must contain the field 'chunk_text' (per field_map).
+    Records must contain the field 'chunk_text' (per field_map). The Index
+    handle is cached for the life of the process.
     """
     if not pc.has_index(SPARSE_INDEX_NAME):
         pc.create_index_for_model(
@@ -56,6 +54,8 @@ def to_sparse_records(chunks: Iterable[Dict]) -> List[Dict]:
     Output records (no 'values'; managed sparse embedding will infer):
       {"id": str, "chunk_text": "...", <flattened meta_*> }
     """
+    chunks = list(chunks)
+    new_ids = iter(uuid4_strs(len(chunks)))
     records: List[Dict] = []
     for idx, c in enumerate(chunks):
         raw_text = c.get("chunk_text") or c.get("chunk") or c.get("text")
@@ -64,8 +64,8 @@ def to_sparse_records(chunks: Iterable[Dict]) -> List[Dict]:
         text = raw_text.strip()
         if not text:
             continue
-        meta = _flatten_metadata(c.get("metadata", {}))
-        rec_id = c.get("id") or str(uuid.uuid4())
+        meta = _flatten_metadata(c.get("metadata"))
+        rec_id = c.get("id") or next(new_ids)
         rec = {
             "id": rec_id, 
             "chunk_text": text,
@@ -85,8 +85,9 @@ def store_sparse_vectors(chunks: Iterable[Dict], batch_size: int = 90):
     for i in range(0, len(records), batch_size):
         batch = records[i:i+batch_size]
         index.upsert_records(NAMESPACE, batch)
-    stats = index.describe_index_stats()
-    print("Sparse index stats:", stats)
+    # describe_index_stats is an extra round-trip; only pay for it when it will be logged
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Sparse index stats: %s", index.describe_index_stats())
 
 def sparse_query(query_text: str, top_k: int = 10, filter: Optional[Dict] = None):
     """
@@ -1,12 +1,12 @@
 from pinecone import Pinecone
 from typing import Iterable, List, Dict
-# from .id_strategy import IDStrategy
-import uuid
+from .id_strategy import uuid4_strs
+import functools
+import logging
 import os
 import time
 from src.observability.instruments import (
-    queries_total, query_errors_total,
-    query_end_to_end_seconds, vector_search_seconds,
+    query_errors_total, vector_search_seconds,
     retrieval_result_count, retrieval_top_score,
     retrieval_any_result_total, no_result_queries_total,
     upsert_records_total, upsert_errors_total, upsert_batch_seconds,
@@ -28,7 +28,12 @@ DENSE_MODEL_OPTIONS = [
 ]
 NAMESPACE = "__default__"  # or "philosophy" if multi-tenant mode is needed
 
+logger = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=None)
 def ensure_index(DENSE_MODEL):
+    # Cached per model: has_index is a control-plane round-trip that every
+    # query and upsert used to repeat; the Index handle is reused thereafter
     index_name = INDEX_NAME + "-" + DENSE_MODEL
     if not pc.has_index(index_name):
         pc.create_index_for_model(
@@ -55,7 +60,7 @@ def _flatten_metadata(meta: Dict[str, any]) -> Dict[str, any]:
         else:
             flat[key] = str(v)
 
-    print(f"Flattened metadata: {flat}")
+    logger.debug("Flattened metadata: %s", flat)
     return flat
 
 def to_records(chunks: Iterable[Dict]) -> List[Dict]:
@@ -67,11 +72,12 @@ def to_records(chunks: Iterable[Dict]) -> List[Dict]:
     }
     Returns records ready for managed embedding (no 'values').
     """
+    chunks = list(chunks)
     records = []
-    for c in chunks:
-        metadata = _flatten_metadata(c.get("metadata", {}))
+    for c, rec_id in zip(chunks, uuid4_strs(len(chunks))):
+        metadata = _flatten_metadata(c.get("metadata"))
         records.append({
-            "id": str(uuid.uuid4()),
+            "id": rec_id,
             "chunk_text": c.get("chunk"),
             "page_number": c.get("page_number"),
             "paragraph_index": c.get("paragraph_index"),
@@ -100,9 +106,9 @@ def store_vectors(chunks: Iterable[Dict], dense_model: str = DEFAULT_DENSE_MODEL
 
 def semantic_query(query: str, top_k: int = 5, dense_model: str = DEFAULT_DENSE_MODEL):
     index = ensure_index(dense_model)
-    print('in semantic_query, index is', index)
-    queries_total.add(1, safe_attrs({"top_k": str(top_k)}))
-    q_start = time.perf_counter()
+    logger.debug("semantic_query index: %s", index)
+    # queries_total / query_end_to_end_seconds are recorded per request by
+    # search_wrapper.search_with_metadata, which also sees cache hits
     try:
         vs_start = time.perf_counter()
         results = index.search(
@@ -132,9 +138,7 @@ def semantic_query(query: str, top_k: int = 5, dense_model: str = DEFAULT_DENSE_
         else:
             no_result_queries_total.add(1, safe_attrs({}))
 
-        query_end_to_end_seconds.record(time.perf_counter() - q_start, safe_attrs({"status": "success", "top_k": str(top_k)}))
         return results
     except Exception as e:
         query_errors_total.add(1, safe_attrs({"error.type": e.__class__.__name__}))
-        query_end_to_end_seconds.record(time.perf_counter() - q_start, safe_attrs({"status": "error", "top_k": str(top_k)}))
         raise
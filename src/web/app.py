@@ -1,5 +1,7 @@
 import os
 import json
+import logging
+import threading
 from datetime import datetime
 from flask import Flask, request, render_template, jsonify
 from ..storage.search_wrapper import search_with_metadata
@@ -7,15 +9,49 @@ from dotenv import load_dotenv
 import google.generativeai as genai
 load_dotenv()
 
-# Use Pinecone inference rerank
-from pinecone import Pinecone
-PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
-pc = Pinecone(api_key=PINECONE_API_KEY)
+logger = logging.getLogger(__name__)
 
+# Use Pinecone inference rerank (shares the storage layer's client)
+from src.storage.vector_store import pc
+
+import torch
 from src.rerank.cross_encoder import CrossEncoderReranker
 from src.rerank.reranker import RERANKER_MODELS, DEFAULT_RERANKER_MODEL
 
-reranker = CrossEncoderReranker()
+_reranker = None
+_reranker_lock = threading.Lock()
+
+def _onnx_backend():
+    return os.getenv("RERANKER_BACKEND", "torch").lower() == "onnx"
+
+def reranker_fork_safe():
+    """
+    True when the reranker may be built before Gunicorn forks its workers, i.e.
+    the torch backend on CPU. A CUDA context or an ONNX Runtime session's thread
+    pool cannot be used in a forked child.
+    """
+    if _onnx_backend():
+        return False
+    # Probe for a GPU through NVML so the check itself does not initialise CUDA
+    os.environ.setdefault("PYTORCH_NVML_BASED_CUDA_CHECK", "1")
+    return not torch.cuda.is_available()
+
+def get_reranker():
+    """
+    Build the cross-encoder on first use in each process, or once in the
+    Gunicorn master when reranker_fork_safe() allows it.
+    """
+    global _reranker
+    if _reranker is None:
+        with _reranker_lock:
+            if _reranker is None:
+                if _onnx_backend():
+                    # Optional: int8 ONNX Runtime backend (requires optimum[onnxruntime])
+                    from src.rerank.onnx_cross_encoder import OnnxCrossEncoderReranker
+                    _reranker = OnnxCrossEncoderReranker()
+                else:
+                    _reranker = CrossEncoderReranker()
+    return _reranker
 
 
 # Optional config usage
@@ -26,7 +62,10 @@ except ImportError:
 
 from src.storage.vector_store import DENSE_MODEL_OPTIONS, DEFAULT_DENSE_MODEL
 
+from src.observability.instruments import setup as setup_metrics
+
 app = Flask(__name__)
+setup_metrics()
 
 if select_config:
     app.config.from_object(select_config())
@@ -39,7 +78,7 @@ if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
     GEMINI_MODEL_NAME = "gemini-2.5-flash"
 else:
-    print("Warning: GEMINI_API_KEY not set. Answer generation will not work.")
+    logger.warning("GEMINI_API_KEY not set. Answer generation will not work.")
 
 def truncate_text(text: str, max_chars: int = 500) -> str:
     """Truncate text to a maximum number of characters."""
@@ -162,8 +201,8 @@ def rerank():
         dense_results = original_results.get("dense_results", [])
         sparse_results = original_results.get("sparse_results", [])
 
-        print(f"Reranking {len(dense_results)} dense results and {len(sparse_results)} sparse results for query: {query}")
-        print("reranker_model is", reranker_model)
+        logger.debug("Reranking %d dense results and %d sparse results for query %r with %s",
+                     len(dense_results), len(sparse_results), query, reranker_model)
         for r in dense_results:
             r["highlighted"] = highlight(r["text"], query)
         for r in sparse_results:
@@ -171,9 +210,8 @@ def rerank():
 
         reranked_dense_results = []
         if reranker_model == "cross-encoder/ms-marco-MiniLM-L-12-v2":
-            reranked_dense_results = reranker.rerank(query, dense_results, text_key="text", top_n=5)
+            reranked_dense_results = get_reranker().rerank(query, dense_results, text_key="text", top_n=5)
         else:
-            print('in pinecone reranker', reranker_model)
             documents = [r["text"] for r in dense_results]
             reranked = pc.inference.rerank(
                 model=reranker_model,
@@ -186,7 +224,7 @@ def rerank():
                 }
             )
 
-            print('pinecone reranked is', reranked)
+            logger.debug("Pinecone rerank response: %s", reranked)
             # Map reranked results to include text and score
             for item in reranked.data:
                 idx = item["index"]
@@ -227,12 +265,11 @@ def rerank():
             reranker_model=reranker_model
         )
     except Exception as e:
-        print(f"Error reranking results: {str(e)}")
+        logger.exception("Error reranking results: %s", e)
         return render_template("results.html", query="", dense_results=[], sparse_results=[], reranked_results=[], k=5, error="An error occurred while reranking results.")
 
 @app.route("/generate_answer", methods=["POST"])
 def generate_answer():
-    print('in generate_answer')
     """Generate an answer using Gemini AI from retrieved context."""
     try:
         # Check if Gemini API key is configured
@@ -270,7 +307,7 @@ def generate_answer():
         return jsonify({"answer": response.text.strip()})
         
     except Exception as e:
-        print(f"Error generating answer: {str(e)}")
+        logger.exception("Error generating answer: %s", e)
         return jsonify({"error": "An error occurred while generating the answer"}), 500
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 """
 WSGI entrypoint for production servers (Gunicorn, uWSGI, etc.).
 Usage:
-    gunicorn -w 3 -b 0.0.0.0:$PORT src.web.wsgi:app
+    gunicorn -c gunicorn_conf.py src.web.wsgi:app
 """
 from src.web.app import app  # Re-use the already-created Flask app
 
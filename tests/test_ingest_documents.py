@@ -0,0 +1,126 @@
+"""
+ingest_documents failure paths, with Pinecone, OpenTelemetry and PDF parsing
+stubbed out: only the batching, manifest and metric bookkeeping is real.
+"""
+import contextlib
+import importlib
+import json
+import os
+import sys
+import types
+
+import pytest
+
+
+class _Instrument:
+    def __init__(self):
+        self.values = []
+
+    def add(self, value, attributes=None):
+        self.values.append(value)
+
+    record = add
+
+
+_INSTRUMENTS = (
+    "documents_ingested_total", "ingestion_errors_total", "document_ingest_seconds",
+    "chunk_count_total", "chunk_chars_sum", "pdf_pages_total", "text_extraction_failures_total",
+    "pdf_load_seconds", "pdf_parse_wait_seconds", "metadata_extract_seconds", "chunking_seconds",
+)
+
+
+_FAILING_PDF = None
+
+
+def _parse_pdf_pages(file_path):
+    # Replaces pdf_loader._parse_pdf_pages in the (forked) pool workers
+    if os.path.basename(file_path) == _FAILING_PDF:
+        raise ValueError("corrupt PDF")
+    return file_path, [(1, "text " * 100), (2, "")], {}, 0.01
+
+
+@pytest.fixture
+def ingest(monkeypatch):
+    stored = []
+    store_error = []
+
+    def store_vectors(chunks, dense_model=None):
+        if store_error:
+            raise store_error[0]
+        stored.append(sorted({c["source_file"] for c in chunks}))
+
+    instruments = types.ModuleType("src.observability.instruments")
+    for name in _INSTRUMENTS:
+        setattr(instruments, name, _Instrument())
+    instruments.safe_attrs = lambda attrs: dict(attrs or {})
+    instruments.time_histogram_ok = lambda hist, attributes=None: contextlib.nullcontext()
+    instruments.setup = lambda: None
+
+    vector_store = types.ModuleType("src.storage.vector_store")
+    vector_store.DEFAULT_DENSE_MODEL = "test-model"
+    vector_store.ensure_index = lambda model: None
+    vector_store.store_vectors = store_vectors
+
+    sparse_store = types.ModuleType("src.storage.sparse_store")
+    sparse_store.ensure_sparse_index = lambda: None
+    sparse_store.store_sparse_vectors = lambda chunks: None
+
+    stubs = {
+        "src.observability.instruments": instruments,
+        "src.storage.vector_store": vector_store,
+        "src.storage.sparse_store": sparse_store,
+    }
+    for name, attrs in (("dotenv", {"load_dotenv": lambda: None}), ("PyPDF2", {"PdfReader": None})):
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            stubs[name] = types.ModuleType(name)
+            stubs[name].__dict__.update(attrs)
+    for name, module in stubs.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.delitem(sys.modules, "src.scripts.ingest_documents", raising=False)
+
+    from src.ingestion import pdf_loader
+    monkeypatch.setattr(pdf_loader, "_parse_pdf_pages", _parse_pdf_pages)
+    module = importlib.import_module("src.scripts.ingest_documents")
+    return types.SimpleNamespace(module=module, stored=stored, store_error=store_error, metrics=instruments)
+
+
+def _make_pdfs(directory, count):
+    for i in range(count):
+        (directory / f"f{i:02d}.pdf").write_bytes(b"")
+
+
+def _manifest(directory):
+    path = directory / ".ingest_manifest.json"
+    return sorted(json.loads(path.read_text())) if path.exists() else []
+
+
+def test_parse_failure_still_stores_earlier_documents(ingest, tmp_path, monkeypatch):
+    _make_pdfs(tmp_path, 5)
+    # Fail the third file in listing order, which is the order the loop follows
+    names = [os.path.basename(p) for p in ingest.module._pdf_paths(str(tmp_path))]
+    monkeypatch.setattr(sys.modules[__name__], "_FAILING_PDF", names[2])
+    before = sorted(names[:2])
+
+    with pytest.raises(ValueError):
+        ingest.module.ingest_documents(str(tmp_path), max_workers=2)
+
+    assert ingest.stored == [before]
+    assert _manifest(tmp_path) == before
+    assert sum(ingest.metrics.documents_ingested_total.values) == len(before)
+    # Extraction time comes from the worker, not the parent's wait on the pool
+    assert ingest.metrics.pdf_load_seconds.values == [0.01, 0.01]
+    assert sum(ingest.metrics.ingestion_errors_total.values) == 1
+
+
+def test_upsert_failure_counts_every_document_in_the_batch(ingest, tmp_path):
+    _make_pdfs(tmp_path, 3)
+    ingest.store_error.append(RuntimeError("pinecone down"))
+
+    with pytest.raises(RuntimeError):
+        ingest.module.ingest_documents(str(tmp_path), max_workers=2)
+
+    assert _manifest(tmp_path) == []
+    assert sum(ingest.metrics.documents_ingested_total.values) == 0
+    assert sum(ingest.metrics.ingestion_errors_total.values) == 3